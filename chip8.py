@@ -3,9 +3,10 @@ import struct
 import random
 import sys
 import time
+from array import array
 from functools import partial
 
-from typing import List, Generator, Dict, Callable
+from typing import Generator, Dict, Callable
 
 from display import Display
 from registerManager import RegisterManager
@@ -14,19 +15,23 @@ from hwTimer import HwTimer
 
 def print_cb_name(fun):
 
-    def wrapper(*args):
-        #print(args[1].__name__, end=" ")
-        return fun(*args)
+    def wrapper(*args, **kwargs):
+        #print(kwargs["instruction"].__name__, end=" ")
+        return fun(*args, **kwargs)
     return wrapper
 
 
 class Chip8(object):
+    __slots__ = ("_opCode", "_pc", "_index", "_delayTimer", "_soundTimer", "_lastTick",
+                 "_stack", "_stackPtr", "_memory", "_registers", "_display", "_drawCount")
+
     MEM_SIZE = 4096
     ROM_START = 0x200
     RAM_SIZE = MEM_SIZE - ROM_START  # bytes
     INSTRUCTION_SIZE = 2  # bytes
     REG_NUM = 16
     REG_SIZE = 1  # bytes
+    STACK_SIZE = 16
 
     FONT_SET = [
         0xF0, 0x90, 0x90, 0x90, 0xF0,  # 0
@@ -54,13 +59,13 @@ class Chip8(object):
 
         self._delayTimer: HwTimer = HwTimer()
         self._soundTimer: HwTimer = HwTimer()
+        self._lastTick: float = time.monotonic()
 
-        self._stack: List[int] = [0] * 16
+        self._stack: array = array("H", bytes(Chip8.STACK_SIZE * 2))
         self._stackPtr: int = 0
 
         self._memory: bytearray = bytearray(Chip8.MEM_SIZE)
         self._registers: RegisterManager = RegisterManager(self.REG_NUM, self.REG_SIZE * 8)
-        self._decoder: Dict[int, Callable[[int], None]] = {}
 
         self._display = Display(64, 32)
         self._drawCount: int = 0
@@ -69,55 +74,6 @@ class Chip8(object):
     def _init(self):
         self._memory[0:0x50] = Chip8.FONT_SET
 
-        self._decoder = {
-            0x0: lambda: self._decoder[self._opCode[1]](),
-            0x00e0: self.clear_scr,
-            0x00ee: self.ret_from_sub,
-
-            0x1: partial(self._decode_address, self.jump),                # 0x1nnn
-            0x2: partial(self._decode_address, self.jsr),                 # 0x2nnn
-            0x3: partial(self._decode_reg_const, self.skip_equal),        # 0x3xkk
-            0x4: partial(self._decode_reg_const, self.skip_nequal),       # 0x4xkk
-            0x5: partial(self._decode_two_regs, self.skip_reg_equal),     # 0x5xy0
-            0x6: partial(self._decode_reg_const, self.mov),               # 0x6xkk
-            0x7: partial(self._decode_reg_const, self.add_constant),      # 0x7xkk
-
-            0x8: self._decode_arithmetic,
-
-            0x80: self.mov_reg,                                           # 0x8xy0
-            0x81: self.logic_or,                                          # 0x8xy1
-            0x82: self.logic_and,                                         # 0x8xy2
-            0x83: self.logic_xor,                                         # 0x8xy3
-            0x84: self.add,                                               # 0x8xy4
-            0x85: self.sub,                                               # 0x8xy5
-            0x86: self.shift_right,                                       # 0x8xy6
-            0x87: self.rsb,                                               # 0x8xy7
-            0x8e: self.shift_left,                                        # 0x8xyE
-
-            0x9: partial(self._decode_two_regs, self.skip_on_reg_neq),    # 0x9xy0
-            0xa: partial(self._decode_address, self.mvi),                 # 0xAnnn
-            0xb: partial(self._decode_address, self.jump_i),              # 0xBnnn
-            0xc: partial(self._decode_reg_const, self.rand),              # 0xCxkk
-            0xd: self._decode_draw,                                       # 0xDxyn
-
-            0xE: self._decode_keys,
-
-            0xE9e: self.skip_if_pressed,                                  # 0xEx9E
-            0xEa1: self.skip_if_npressed,                                 # 0xExA1
-
-            0xf: self._decode_system,
-
-            0xf07: self.get_delay_timer,                                  # 0xFx07
-            0xf0a: self.await_key,                                        # 0xFx0A
-            0xf15: self.set_delay_timer,                                  # 0xFx15
-            0xf18: self.set_sound_timer,                                  # 0xFx18
-            0xf1e: self.add_index,                                        # 0xFx1E
-            0xf29: self.font,                                             # 0xFx29
-            0xf33: self.store_bcd,                                        # 0xFx33
-            0xf55: self.store_regs,                                       # 0xFx55
-            0xf65: self.load_regs,                                        # 0xFx65
-        }
-
     @property
     def memory_dump(self) -> Generator[str, None, None]:
         unpacked = struct.unpack(">{}H".format(Chip8.MEM_SIZE // 2), self._memory)
@@ -136,6 +92,7 @@ class Chip8(object):
 
     def emulate_cycle(self):
         time.sleep(0.001)
+        self._tick_timers()
         self._fetch()
         self._decode()
         if self._drawCount >= 1:
@@ -145,6 +102,12 @@ class Chip8(object):
             sys.stdout.write("\r")
             self._drawCount = 0
 
+    def _tick_timers(self):
+        now = time.monotonic()
+        elapsed, self._lastTick = now - self._lastTick, now
+        self._delayTimer.tick(elapsed)
+        self._soundTimer.tick(elapsed)
+
     def _fetch(self):
         self._opCode = bytes(self._memory[self._pc: self._pc + self.INSTRUCTION_SIZE])
         self._pc += self.INSTRUCTION_SIZE
@@ -152,7 +115,7 @@ class Chip8(object):
     def _decode(self):
         code = self._opCode[0] >> 4
         try:
-            self._decoder[code]()
+            self._DECODER[code](self)
         except KeyError:
             # invalid instruction
             print("Invalid op-code: {}!!".format(self._opCode.hex()))
@@ -166,7 +129,7 @@ class Chip8(object):
         reg_y = self._opCode[1] >> 4
 
         # print("{:x},  {:x}".format(reg_x, reg_y))
-        instruction(reg_x, reg_y)
+        instruction(self, reg_x, reg_y)
 
     @print_cb_name
     def _decode_reg_const(self, instruction: Callable[[int, int], None]):
@@ -174,7 +137,7 @@ class Chip8(object):
         const = self._opCode[1]
 
         # print("{:x},  {:x}".format(reg, const))
-        instruction(reg, const)
+        instruction(self, reg, const)
 
     @print_cb_name
     def _decode_address(self, instruction: Callable[[int], None]):
@@ -182,7 +145,10 @@ class Chip8(object):
         address = ((self._opCode[0] & 0x0F) << 8) | self._opCode[1]
 
         # print("{:x}".format(address))
-        instruction(address)
+        instruction(self, address)
+
+    def _decode_flow(self):
+        return self._DECODER[self._opCode[1]](self)
 
     def _decode_draw(self):
         x = self._opCode[0] & 0x0F
@@ -195,29 +161,32 @@ class Chip8(object):
 
         code = 0x8 << 4 | (self._opCode[1] & 0x0F)
 
-        return self._decode_two_regs(self._decoder[code])
+        return self._decode_two_regs(instruction=self._DECODER[code])
 
     def _decode_keys(self):
         code = 0xE << 8 | self._opCode[1]
         x = self._opCode[0] & 0x0F
 
-        return self._decoder[code](x)
+        return self._DECODER[code](self, x)
 
     def _decode_system(self):
         code = 0xF << 8 | self._opCode[1]
         x = self._opCode[0] & 0x0F
 
-        return self._decoder[code](x)
+        return self._DECODER[code](self, x)
 
     def clear_scr(self):
         """00E0 Clear the screen"""
         self._display.clear()
 
     def ret_from_sub(self):
-        """00EE return from subroutine call"""
+        """00EE return from subroutine call, raises RuntimeError if the stack is empty"""
+
+        if self._stackPtr == 0:
+            raise RuntimeError("Stack underflow!")
 
-        self._pc = self._stack.pop()
         self._stackPtr = self._stackPtr - 1
+        self._pc = self._stack[self._stackPtr]
 
     def jump(self, address: int):
         """1xxx jump to address xxx"""
@@ -225,10 +194,13 @@ class Chip8(object):
         self._pc = address
 
     def jsr(self, address: int):
-        """2xxx jump to subroutine at address xxx """
+        """2xxx jump to subroutine at address xxx, raises RuntimeError once STACK_SIZE calls are nested"""
 
+        if self._stackPtr == Chip8.STACK_SIZE:
+            raise RuntimeError("Stack overflow!")
+
+        self._stack[self._stackPtr] = self._pc
         self._stackPtr = self._stackPtr + 1
-        self._stack.append(self._pc)
         self._pc = address
 
     def skip_equal(self, reg: int, value: int):
@@ -362,7 +334,7 @@ class Chip8(object):
 
     def get_delay_timer(self, reg: int):
         """fr07 get delay timer into vr"""
-        time.sleep(0.1)
+        self._tick_timers()
         self._registers[reg] = self._delayTimer.value
 
     def await_key(self, params: bytes):
@@ -372,24 +344,14 @@ class Chip8(object):
     def set_delay_timer(self, reg: int):
         """set the delay timer to vr"""
         # print("{} {}".format("set_delay_timer", reg))
-        try:
-            self._delayTimer.value = self._registers[reg]
-            self._delayTimer.start()
-        except RuntimeError:
-            self._delayTimer = HwTimer()
-            self._delayTimer.value = self._registers[reg]
-            self._delayTimer.start()
+        self._tick_timers()
+        self._delayTimer.value = self._registers[reg]
 
     def set_sound_timer(self, reg: int):
         """fr18 set the sound timer to vr"""
 
-        try:
-            self._soundTimer.value = self._registers[reg]
-            self._soundTimer.start()
-        except RuntimeError:
-            self._soundTimer = HwTimer()
-            self._soundTimer.value = self._registers[reg]
-            self._soundTimer.start()
+        self._tick_timers()
+        self._soundTimer.value = self._registers[reg]
 
     def add_index(self, reg: int):
         """fr1e add register vr to the index register"""
@@ -428,6 +390,56 @@ class Chip8(object):
         for i in range(0, reg + 1):
             self._registers[i] = self._memory[self._index + i]
 
+    # shared by all instances, handlers take the emulator as their first argument
+    _DECODER: Dict[int, Callable[..., None]] = {
+        0x0: _decode_flow,
+        0x00e0: clear_scr,
+        0x00ee: ret_from_sub,
+
+        0x1: partial(_decode_address, instruction=jump),                # 0x1nnn
+        0x2: partial(_decode_address, instruction=jsr),                 # 0x2nnn
+        0x3: partial(_decode_reg_const, instruction=skip_equal),        # 0x3xkk
+        0x4: partial(_decode_reg_const, instruction=skip_nequal),       # 0x4xkk
+        0x5: partial(_decode_two_regs, instruction=skip_reg_equal),     # 0x5xy0
+        0x6: partial(_decode_reg_const, instruction=mov),               # 0x6xkk
+        0x7: partial(_decode_reg_const, instruction=add_constant),      # 0x7xkk
+
+        0x8: _decode_arithmetic,
+
+        0x80: mov_reg,                                                  # 0x8xy0
+        0x81: logic_or,                                                 # 0x8xy1
+        0x82: logic_and,                                                # 0x8xy2
+        0x83: logic_xor,                                                # 0x8xy3
+        0x84: add,                                                      # 0x8xy4
+        0x85: sub,                                                      # 0x8xy5
+        0x86: shift_right,                                              # 0x8xy6
+        0x87: rsb,                                                      # 0x8xy7
+        0x8e: shift_left,                                               # 0x8xyE
+
+        0x9: partial(_decode_two_regs, instruction=skip_on_reg_neq),    # 0x9xy0
+        0xa: partial(_decode_address, instruction=mvi),                 # 0xAnnn
+        0xb: partial(_decode_address, instruction=jump_i),              # 0xBnnn
+        0xc: partial(_decode_reg_const, instruction=rand),              # 0xCxkk
+        0xd: _decode_draw,                                              # 0xDxyn
+
+        0xE: _decode_keys,
+
+        0xE9e: skip_if_pressed,                                         # 0xEx9E
+        0xEa1: skip_if_npressed,                                        # 0xExA1
+
+        0xf: _decode_system,
+
+        0xf07: get_delay_timer,                                         # 0xFx07
+        0xf0a: await_key,                                               # 0xFx0A
+        0xf15: set_delay_timer,                                         # 0xFx15
+        0xf18: set_sound_timer,                                         # 0xFx18
+        0xf1e: add_index,                                               # 0xFx1E
+        0xf29: font,                                                    # 0xFx29
+        0xf33: store_bcd,                                               # 0xFx33
+        0xf55: store_regs,                                              # 0xFx55
+        0xf65: load_regs,                                               # 0xFx65
+    }
+
 
 if __name__ == "__main__":
     emulator = Chip8()
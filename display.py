@@ -4,27 +4,29 @@ BYTE_SIZE = 8
 
 
 class Display(object):
+    """Monochrome framebuffer, one bit per pixel, rows stored back to back in a single bytearray"""
+    __slots__ = ("_collision", "_width", "_height", "_data", "_onDraw")
+
     def __init__(self, width: int, height: int):
         width //= BYTE_SIZE
         self._collision: bool = False
         self._width, self._height = width, height
-        self._data = [bytearray(width) for i in range(height)]
+        self._data = bytearray(width * height)
         self._onDraw = None
 
     def draw(self, x: int, y: int, sprite: List[int]):
+        # coordinates wrap around the screen, keeping every write inside its own row
+        x %= self._width * BYTE_SIZE
+        y %= self._height
 
         idx, r = divmod(x, BYTE_SIZE)
 
         mask = 0xFF << (BYTE_SIZE - r) & 0xFF if r > 0 else 0x0
         next_idx = (idx + 1) % self._width
 
-        if idx > self._width:
-            raise ValueError("Display Error: Invalid x coordinate")
-        if y > self._height:
-            raise ValueError("Display Error: Invalid y coordinate")
-
         for sprite_part in sprite:
-            disp_val = (self._data[y][idx] << r) | (self._data[y][next_idx] >> (BYTE_SIZE - r))
+            row = y * self._width
+            disp_val = (self._data[row + idx] << r) | (self._data[row + next_idx] >> (BYTE_SIZE - r))
 
             disp_val &= sprite_part
 
@@ -33,8 +35,8 @@ class Display(object):
             else:
                 self._collision = False
 
-            self._data[y][idx] ^= sprite_part >> r
-            self._data[y][next_idx] ^= (sprite_part << (BYTE_SIZE - r)) & 0xFF
+            self._data[row + idx] ^= sprite_part >> r
+            self._data[row + next_idx] ^= (sprite_part << (BYTE_SIZE - r)) & 0xFF
 
             y = (y + 1) % self._height
 
@@ -42,7 +44,7 @@ class Display(object):
             self.on_draw()
 
     def clear(self):
-        self._data = self._data = [bytearray(self._width) for i in range(self._height)]
+        self._data[:] = bytes(len(self._data))
 
     @property
     def collision(self):
@@ -64,17 +66,29 @@ class Display(object):
     def on_draw(self, handler: Callable[[int, int, int], None]):
         self._onDraw = handler
 
+    def _row_start(self, key: int) -> int:
+        if key < 0:
+            key += self._height
+        if not 0 <= key < self._height:
+            raise IndexError("Display Error: Invalid row index")
+        return key * self._width
+
     def __setitem__(self, key, value):
-        self._data[key] = value
+        if len(value) != self._width:
+            raise ValueError("Display Error: Invalid row length")
+        row = self._row_start(key)
+        self._data[row: row + self._width] = value
 
     def __getitem__(self, item):
-        return self._data[item]
+        row = self._row_start(item)
+        return memoryview(self._data)[row: row + self._width]
 
     def __str__(self):
         return "".join(["".join(line) for line in self.print()])
 
     def print(self):
-        for line in self._data:
+        for y in range(self._height):
+            line = self[y]
             str_line = []
             for byte in line:
                 str_line.append(f"{byte:08b}".replace("0", " ").replace("1", "*"))
@@ -102,7 +116,75 @@ def test01(disp: Display):
     print(disp)
 
 
+def test03(disp: Display):
+    disp.clear()
+    disp.draw(64, 0, [0xFF])
+    assert disp[0][0] == 0xFF, "sprite at x=64 should wrap to the start of its own row"
+    assert not any(disp[1]), "sprite at x=64 leaked into the next row"
+
+    disp.clear()
+    disp.draw(71, 0, [0xFF])
+    assert disp[0][0] == 0x01 and disp[0][1] == 0xFE, "sprite at x=71 should wrap to x=7 of its own row"
+    assert not any(disp[1]), "sprite at x=71 leaked into the next row"
+    print(disp)
+
+
+def test04(disp: Display):
+    disp.clear()
+    disp[-1] = bytes([0xFF] * (disp.width // BYTE_SIZE))
+    assert disp[-1][0] == 0xFF and disp[disp.height - 1][0] == 0xFF, "negative row index should address the last row"
+    assert len(disp._data) == disp.width // BYTE_SIZE * disp.height, "row assignment resized the framebuffer"
+
+    for key in (disp.height, -disp.height - 1):
+        try:
+            disp[key]
+        except IndexError:
+            pass
+        else:
+            raise AssertionError("row {} should be out of range".format(key))
+
+    try:
+        disp[0] = b"\x01"
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("row of the wrong length should be rejected")
+    assert len(disp._data) == disp.width // BYTE_SIZE * disp.height, "row assignment resized the framebuffer"
+
+
+def test05():
+    from chip8 import Chip8
+
+    cpu = Chip8()
+    for depth in range(Chip8.STACK_SIZE):
+        cpu._opCode = bytes([0x22, 0x00])  # jsr 0x200, dispatched through Chip8._DECODER
+        cpu._decode()
+    assert cpu._stackPtr == Chip8.STACK_SIZE and cpu._pc == 0x200, "nested calls within the stack size should succeed"
+
+    try:
+        cpu._decode()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("call nested past the stack size should raise")
+
+    for depth in range(Chip8.STACK_SIZE):
+        cpu._opCode = bytes([0x00, 0xEE])  # ret
+        cpu._decode()
+    assert cpu._stackPtr == 0, "every call should return"
+
+    try:
+        cpu._decode()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("return on an empty stack should raise")
+
+
 if __name__ == "__main__":
     disp = Display(64, 4)
     test01(disp)
     test02(disp)
+    test03(disp)
+    test04(disp)
+    test05()
@@ -1,4 +1,3 @@
-import threading
 import time
 
 
@@ -17,14 +16,20 @@ def timeit(method):
     return timed
 
 
-class HwTimer(threading.Thread):
+class HwTimer(object):
+    """Plain down counter, advanced by the owner with the wall time elapsed between cycles"""
+    __slots__ = ("_bitCount", "_value", "_delay", "_elapsed")
 
     def __init__(self, bits: int = 8, freq: int = 60):
         self._bitCount = bits
         self._value = 0
-        self._freq = freq
-        self._delay = 1 / self._freq
-        super().__init__()
+        self._delay = 1 / freq
+        self._elapsed = 0.0
+
+    @property
+    def delay(self) -> float:
+        """Tick period in seconds"""
+        return self._delay
 
     @property
     def value(self) -> int:
@@ -34,28 +39,33 @@ class HwTimer(threading.Thread):
     def value(self, value: int):
         base = 1 << self._bitCount
         self._value = value % base
+        self._elapsed = 0.0
+
+    def tick(self, elapsed: float):
+        if self._value == 0:
+            return
 
-    def _tick(self):
-        if self._value > 0:
-            self._value -= 1
+        self._elapsed += elapsed
+        ticks = int(self._elapsed // self._delay)
+        self._elapsed -= ticks * self._delay
+        self._value = max(self._value - ticks, 0)
 
     def abort(self):
         self._value = 0
-
-    def run(self) -> None:
-
-        while self._value > 0:
-            time.sleep(self._delay)
-            self._tick()
+        self._elapsed = 0.0
 
 
 @timeit
 def timer_process(hw_timer: HwTimer):
-    hw_timer.start()
-    hw_timer.join()
+    last = time.monotonic()
+    while hw_timer.value > 0:
+        time.sleep(hw_timer.delay)
+        now = time.monotonic()
+        hw_timer.tick(now - last)
+        last = now
 
 
 if __name__ == "__main__":
     timer = HwTimer(8, 60)
     timer.value = 240
-    timer_process(timer)
\ No newline at end of file
+    timer_process(timer)
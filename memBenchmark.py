@@ -0,0 +1,38 @@
+import sys
+import tracemalloc
+
+from chip8 import Chip8
+from hwTimer import timeit
+
+INSTANCE_COUNT = 100000
+BUDGET = 6 * 1024  # bytes per instance on top of the emulated memory
+
+
+@timeit
+def create_instances(count: int):
+    return [Chip8() for i in range(count)]
+
+
+def instance_footprint(count: int) -> float:
+    """Average number of bytes allocated per Chip8 instance, emulated memory excluded"""
+    Chip8()  # warm up shared, class level allocations
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    instances = create_instances(count)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # the list holding the instances is benchmark overhead, not emulator state
+    overhead = sys.getsizeof(instances)
+    return (after - before - overhead) / count - Chip8.MEM_SIZE
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else INSTANCE_COUNT
+    footprint = instance_footprint(count)
+
+    print("{} instances, {:.0f} bytes per instance beyond memory (budget {} bytes)".format(
+        count, footprint, BUDGET))
+    if footprint > BUDGET:
+        sys.exit(1)
@@ -2,6 +2,7 @@ from typing import List
 
 
 class RegisterManager(object):
+    __slots__ = ("_reg_bit_count", "_data", "_overflow")
 
     def __init__(self, reg_count: int, reg_bits: int):
         self._reg_bit_count: int = reg_bits